@@ -1,6 +1,33 @@
 from .light import Dbf, open_db
 
 
+def read_dataframe(db, *args, **kwargs):
+    """Reads DBF file (maybe even from zip) into pandas DataFrame.
+
+    Requires `pandas` package (can be installed with: `pip install dbf_light[pandas]`).
+
+    See `dbf_light.frames.read_dataframe` for arguments description.
+
+    :rtype: pandas.DataFrame|iterator
+
+    """
+    from .frames import read_dataframe
+    return read_dataframe(db, *args, **kwargs)
+
+
+def diff(old, new, *args, **kwargs):
+    """Generator yielding changes (inserted, updated, deleted rows)
+    between two versions of the same DB.
+
+    See `dbf_light.diffing.diff` for arguments description.
+
+    :rtype: Change
+
+    """
+    from .diffing import diff
+    return diff(old, new, *args, **kwargs)
+
+
 VERSION = (1, 0, 0)
 """Application version number tuple."""
 
@@ -33,6 +33,18 @@ class Definition(object):
         unpacked = struct.unpack(cls._struct_rule, raw)
         return dict(zip(cls._names, unpacked))
 
+    @classmethod
+    def iter_from_bytes(cls, raw):
+        """Yields definitions for consecutive structures packed in raw bytes.
+
+        :param bytes raw:
+        """
+        names = cls._names
+        rule = cls._struct_rule
+
+        for offset in range(0, len(raw), cls._struct_size):
+            yield cls(dict(zip(names, struct.unpack_from(rule, raw, offset))))
+
     @classmethod
     def from_file(cls, fileobj):
         data = fileobj.read(cls._struct_size)
@@ -6,7 +6,7 @@ from decimal import Decimal
 
 
 def parse_string(field, val):
-    return val.decode(field.encoding).strip()
+    return val.strip()
 
 
 def parse_date(field, val):
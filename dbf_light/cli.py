@@ -2,6 +2,8 @@
 import click
 
 from dbf_light import VERSION_STR, Dbf, open_db
+from dbf_light.diffing import INSERTED, UPDATED, DELETED, diff as diff_db
+from dbf_light.exceptions import DbfException
 
 arg_db = click.argument('db', type=click.Path(dir_okay=False))
 opt_encoding = click.option('--encoding', help='Encoding used by DB')
@@ -58,6 +60,59 @@ def describe(db, zip, case_insensitive):
             click.secho('  %s: %s' % (field.type, field))
 
 
+@entry_point.command()
+@click.argument('old', type=click.Path(dir_okay=False))
+@click.argument('new', type=click.Path(dir_okay=False))
+@click.option('-k', '--key', help='Key field name. Can be used several times.', multiple=True, required=True)
+@opt_encoding
+@click.option(
+    '--old-zip', help='Zip filename containing old DBF', type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    '--new-zip', help='Zip filename containing new DBF', type=click.Path(exists=True, dir_okay=False))
+@opt_nocase
+def diff(old, new, key, encoding, old_zip, new_zip, case_insensitive):
+    """Show rows changed between two versions of .dbf file."""
+
+    changes = diff_db(
+        old, new, list(key), old_zipped=old_zip, new_zipped=new_zip,
+        encoding=encoding, case_sensitive=not case_insensitive)
+
+    try:
+        _show_changes(changes, key)
+
+    except DbfException as e:
+        raise click.ClickException('%s' % e)
+
+
+def _show_changes(changes, key):
+    counts = {}
+
+    for change in changes:
+        kind = change.kind
+        counts[kind] = counts.get(kind, 0) + 1
+
+        click.secho('')
+
+        if kind == INSERTED:
+            click.secho('+ %s' % (change.new,), fg='green')
+
+        elif kind == DELETED:
+            click.secho('- %s' % (change.old,), fg='red')
+
+        else:
+            click.secho('* %s' % ', '.join('%s=%s' % (name, getattr(change.new, name)) for name in key), fg='yellow')
+
+            for name, val in change.new._asdict().items():
+                val_old = getattr(change.old, name)
+
+                if val != val_old:
+                    click.secho('  %s: %s -> %s' % (name, val_old, val))
+
+    click.secho('')
+    click.secho('Inserted: %s, updated: %s, deleted: %s' % tuple(
+        counts.get(kind, 0) for kind in (INSERTED, UPDATED, DELETED)))
+
+
 def main():
     entry_point(obj={})
 
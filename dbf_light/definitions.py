@@ -29,17 +29,6 @@ class Field(Definition):
         ('mdx', '?'),  # dBASE IV only
     )
 
-    @classmethod
-    def from_file(cls, fileobj, name_lower=True, encoding=None):
-        field = super(Field, cls).from_file(fileobj)
-
-        if name_lower:
-            field.set_name(field.data['name'].lower())
-
-        field.encoding = encoding
-
-        return field
-
     def __init__(self, data):
         super(Field, self).__init__(data)
         data = self.data
@@ -50,6 +39,18 @@ class Field(Definition):
         self.len = bytes_to_int(data['len'])
         self.type = data['type']
 
+        self.offset = 0
+        """Field data offset within a record (including deletion marker)."""
+
+        self.encoding = None
+        self.raw = False
+        """Whether to return stripped bytes instead of decoded string for character fields."""
+
+    @property
+    def is_text(self):
+        """Whether field value is cast from decoded text (not from raw bytes)."""
+        return self.type in CAST_MAP and not (self.raw and self.type == b'C')
+
     def __str__(self):
         return self.name
 
@@ -57,7 +58,24 @@ class Field(Definition):
         self.name = self.data['name'] = name
 
     def cast(self, value):
-        return CAST_MAP.get(self.data['type'], lambda field, val: val)(self, value)
+        """Casts raw field bytes into Python object.
+
+        :param bytes value:
+
+        """
+        if not self.is_text:
+            # Raw character data or a field of unsupported type.
+            return value.strip() if self.type == b'C' else value
+
+        return self.cast_text(value.decode(self.encoding))
+
+    def cast_text(self, value):
+        """Casts already decoded field value into Python object.
+
+        :param str|unicode value:
+
+        """
+        return CAST_MAP[self.type](self, value)
 
 
 class Prolog(Definition):
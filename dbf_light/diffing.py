@@ -0,0 +1,124 @@
+# -*- encoding: utf-8 -*-
+from __future__ import unicode_literals
+
+from collections import namedtuple
+from contextlib import contextmanager
+
+from .exceptions import DbfException
+from .light import Dbf, open_db
+from .sorting import MEMORY_LIMIT, get_key, iter_sorted
+
+INSERTED = 'inserted'
+UPDATED = 'updated'
+DELETED = 'deleted'
+
+
+Change = namedtuple('Change', ['kind', 'old', 'new'])
+"""Row change. `old` is None for inserted rows, `new` is None for deleted ones."""
+
+
+def diff(old, new, key, memory_limit=MEMORY_LIMIT, old_zipped=None, new_zipped=None, **kwargs):
+    """Generator yielding changes between two versions of the same DB
+    ordered by key fields.
+
+    Both DBs are sorted by key (see `Dbf.iter_sorted`) and walked simultaneously,
+    so memory usage is bounded. Raw records are compared, rows are cast
+    only for records which differ.
+
+    .. code-block::
+
+        for change in diff('old.dbf', 'new.dbf', key='code'):
+            print(change.kind, change.old, change.new)
+
+    :param str|unicode|file|Dbf old: Old DB: file name, file-like object or Dbf.
+
+    :param str|unicode|file|Dbf new: New DB: file name, file-like object or Dbf.
+
+    :param str|unicode|list key: Key field name or a list of names.
+        Key must be unique, DbfException is raised on duplicates.
+
+    :param int memory_limit: Approximate memory limit (bytes) for sorting.
+
+    :param str|unicode old_zipped: .zip file path or a file-like object containing old DB.
+
+    :param str|unicode new_zipped: .zip file path or a file-like object containing new DB.
+
+    :param kwargs: Arguments for `open_db` used if file names or file-like objects are given.
+
+    :rtype: Change
+    """
+    with _open(old, old_zipped, kwargs) as dbf_old:
+        with _open(new, new_zipped, kwargs) as dbf_new:
+
+            if _get_layout(dbf_old) != _get_layout(dbf_new):
+                raise DbfException('Unable to compare DBs with different fields or encodings.')
+
+            # Both sorted runs may be in memory at the same time.
+            memory_limit //= 2
+
+            iter_old = _iter_keyed(dbf_old, key, memory_limit, 'old')
+            iter_new = _iter_keyed(dbf_new, key, memory_limit, 'new')
+
+            cast_old = dbf_old.cast_record
+            cast_new = dbf_new.cast_record
+
+            old_key, record_old = next(iter_old, (None, None))
+            new_key, record_new = next(iter_new, (None, None))
+
+            while record_old is not None and record_new is not None:
+
+                if old_key < new_key:
+                    yield Change(DELETED, cast_old(record_old), None)
+                    old_key, record_old = next(iter_old, (None, None))
+
+                elif old_key > new_key:
+                    yield Change(INSERTED, None, cast_new(record_new))
+                    new_key, record_new = next(iter_new, (None, None))
+
+                else:
+                    if record_old != record_new:
+                        yield Change(UPDATED, cast_old(record_old), cast_new(record_new))
+
+                    old_key, record_old = next(iter_old, (None, None))
+                    new_key, record_new = next(iter_new, (None, None))
+
+            while record_old is not None:
+                yield Change(DELETED, cast_old(record_old), None)
+                old_key, record_old = next(iter_old, (None, None))
+
+            while record_new is not None:
+                yield Change(INSERTED, None, cast_new(record_new))
+                new_key, record_new = next(iter_new, (None, None))
+
+
+def _iter_keyed(dbf, key_fields, memory_limit, title):
+    """Yields (key, record) pairs sorted by key. Raises on duplicate keys."""
+    key = get_key(dbf, key_fields)
+    key_prev = None
+
+    for record in iter_sorted(dbf, key_fields, memory_limit=memory_limit):
+        key_current = key(record)
+
+        if key_current == key_prev:
+            raise DbfException('Duplicate key in %s DB: %s' % (title, dbf.cast_record(record)))
+
+        key_prev = key_current
+
+        yield key_current, record
+
+
+@contextmanager
+def _open(db, zipped, kwargs):
+
+    if isinstance(db, Dbf):
+        yield db
+
+    else:
+        with open_db(db, zipped, **kwargs) as dbf:
+            yield dbf
+
+
+def _get_layout(dbf):
+    return dbf.prolog.data['len_rec'], [
+        (field.name, field.type, field.offset, field.len, field.data['decimal_count'], field.encoding, field.raw)
+        for field in dbf.fields]
@@ -0,0 +1,255 @@
+# -*- encoding: utf-8 -*-
+from __future__ import unicode_literals
+
+import numpy as np
+import pandas as pd
+
+from .exceptions import DbfException
+from .light import open_db
+
+CHUNKSIZE_READ = 65536
+"""Number of records read at once when no chunk size is requested."""
+
+
+def read_dataframe(
+        db, columns=None, chunksize=None, zipped=None, categorical=None,
+        encoding=None, fieldnames_lower=True, case_sensitive=True, encodings=None):
+    """Reads DBF file (maybe even from zip) into pandas DataFrame.
+
+    Columns are built right from records data with dtypes derived from fields:
+
+        * C - str or category;
+        * N - Int64 (nullable) or float64 if field has decimals or is longer than 18;
+        * F - float64;
+        * D - datetime64[s] (blank and 00000000 are NaT, invalid dates raise DbfException);
+        * L - boolean (nullable);
+        * M - Int64 (memo block number).
+
+    .. code-block::
+
+        df = read_dataframe('some.dbf', columns=['name', 'cost'])
+
+        for df in read_dataframe('some.dbf', chunksize=10000, zipped='myarch.zip'):
+            ...
+
+    :param str|unicode|file db: .dbf file name or a file-like object.
+
+    :param list columns: Field names to read. All fields are read if not set.
+
+    :param int chunksize: If set, an iterator is returned yielding DataFrames
+        with up to this number of rows. Chunks without rows (e.g. deleted) are skipped.
+
+    :param str|unicode zipped: .zip file path or a file-like object.
+
+    :param list categorical: Names of fields to be read as categorical.
+        Useful for low-cardinality character fields.
+
+    :param str|unicode encoding: Encoding used by DB.
+        This will be used if there's no encoding information in the DB itself.
+
+    :param bool fieldnames_lower: Lowercase field names.
+
+    :param bool case_sensitive: Whether DB filename is case sensitive.
+
+    :param dict encodings: Per-field encoding overrides: field name -> encoding.
+
+    :rtype: pandas.DataFrame|iterator
+
+    """
+    iter_frames = _iter_frames(
+        db, zipped=zipped, columns=columns, chunksize=chunksize, categorical=categorical,
+        kwargs=dict(
+            encoding=encoding,
+            fieldnames_lower=fieldnames_lower,
+            case_sensitive=case_sensitive,
+            encodings=encodings,
+        ))
+
+    if chunksize:
+        return iter_frames
+
+    return next(iter_frames)
+
+
+def _iter_frames(db, zipped, columns, chunksize, categorical, kwargs):
+    with open_db(db, zipped, **kwargs) as dbf:
+
+        fields = dbf.fields
+
+        if columns is not None:
+            fields = _pick_fields(fields, columns, 'columns')
+
+        categorical = set(field.name for field in _pick_fields(fields, categorical or [], 'categorical'))
+        len_rec = dbf.prolog.data['len_rec']
+
+        def to_frame(chunks):
+            data = {}
+
+            for field in fields:
+                values = [chunk.pop(0) for chunk in chunks]  # Free memory column by column.
+                values = values[0] if len(values) == 1 else _concat(values)
+
+                if field.type == b'C':
+                    values = pd.Series(values, dtype=str, copy=False).array
+
+                if field.name in categorical:
+                    values = pd.Categorical(values)
+
+                data[field.name] = values
+
+            return pd.DataFrame(data, columns=[field.name for field in fields])
+
+        def get_records(chunk):
+            records = np.frombuffer(chunk, dtype=np.uint8).reshape(-1, len_rec)
+            return records[records[:, 0] != ord('*')]  # Skip deleted.
+
+        def get_columns(records):
+            return [_get_column(field, records) for field in fields]
+
+        if chunksize:
+            for chunk in dbf.iter_chunks(chunksize):
+                records = get_records(chunk)
+
+                if len(records):
+                    yield to_frame([get_columns(records)])
+
+        else:
+            chunks = [get_columns(get_records(chunk)) for chunk in dbf.iter_chunks(CHUNKSIZE_READ)]
+
+            if not chunks:
+                # No records. Empty columns still have proper dtypes.
+                chunks = [get_columns(get_records(b''))]
+
+            yield to_frame(chunks)
+
+
+def _pick_fields(fields, names, title):
+    by_name = {field.name: field for field in fields}
+    unknown = [name for name in names if name not in by_name]
+
+    if unknown:
+        raise DbfException('Unknown %s: %s' % (title, ', '.join(unknown)))
+
+    return [by_name[name] for name in names]
+
+
+def _concat(values):
+    if isinstance(values[0], np.ndarray):
+        return np.concatenate(values)
+
+    return pd.concat([pd.Series(value, copy=False) for value in values], ignore_index=True).array
+
+
+def _get_column(field, records):
+    """Returns an array of field values taken from records.
+
+    :param Field field:
+    :param numpy.ndarray records: uint8 array of shape (records, record length).
+
+    """
+    values = np.ascontiguousarray(records[:, field.offset:field.offset + field.len])
+    values = values.view('S%s' % field.len).ravel()
+
+    converter = COLUMN_CONVERTERS.get(field.type)
+
+    if converter is None:
+        return np.array(values.tolist(), dtype=object)
+
+    return converter(field, values)
+
+
+def _get_blanks(values):
+    values = np.char.strip(values)
+
+    return values, values == b''
+
+
+def column_string(field, values):
+    encoding = field.encoding
+
+    return np.array([value.decode(encoding).strip() for value in values.tolist()], dtype=object)
+
+
+def column_integer(field, values):
+    values, blanks = _get_blanks(values)
+    values[blanks] = b'0'
+
+    return pd.arrays.IntegerArray(values.astype(np.int64), blanks)
+
+
+def column_float(field, values):
+    values, blanks = _get_blanks(values)
+    values[blanks] = b'0'
+
+    values = values.astype(np.float64)
+    values[blanks] = np.nan
+
+    return values
+
+
+def column_numeric(field, values):
+    if not field.data['decimal_count'] and field.len <= 18:
+        # Any value fits into int64.
+        return column_integer(field, values)
+
+    return column_float(field, values)
+
+
+def column_date(field, values):
+    values, blanks = _get_blanks(values)
+    blanks |= values == b'00000000'  # Often used for empty date.
+    values[blanks] = b'19700101'
+
+    error = 'Invalid date value(s) in field: %s' % field.name
+
+    try:
+        values = values.astype(np.int64)
+
+    except ValueError:
+        raise DbfException(error)
+
+    years, rest = np.divmod(values, 10000)
+    months, days = np.divmod(rest, 100)
+
+    dates = (
+        (years - 1970).astype('datetime64[Y]') +
+        (months - 1).astype('timedelta64[M]')
+    ).astype('datetime64[D]') + (days - 1).astype('timedelta64[D]')
+
+    if (_to_ymd(dates) != values).any():
+        # Out of range month or day rolled over.
+        raise DbfException(error)
+
+    dates = dates.astype('datetime64[s]')
+    dates[blanks] = np.datetime64('NaT')
+
+    return dates
+
+
+def _to_ymd(dates):
+    """Returns YYYYMMDD integers for dates to check they are not rolled over."""
+    years = dates.astype('datetime64[Y]')
+    months = dates.astype('datetime64[M]')
+
+    return (
+        (years.astype(np.int64) + 1970) * 10000 +
+        ((months - years).astype(np.int64) + 1) * 100 +
+        (dates - months).astype(np.int64) + 1
+    )
+
+
+def column_bool(field, values):
+    values = np.char.lower(np.char.strip(values))
+    blanks = (values == b'') | (values == b'?')
+
+    return pd.arrays.BooleanArray((values == b't') | (values == b'y'), blanks)
+
+
+COLUMN_CONVERTERS = {
+    b'C': column_string,
+    b'D': column_date,
+    b'N': column_numeric,
+    b'F': column_float,
+    b'L': column_bool,
+    b'M': column_integer,
+}
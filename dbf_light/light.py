@@ -1,14 +1,11 @@
 # -*- encoding: utf-8 -*-
 from __future__ import unicode_literals
 
-import struct
 from os import path, listdir
 from collections import namedtuple
 from contextlib import contextmanager
-from functools import partial
-from zipfile import ZipFile
 
-from .utils import string_types, pick_name
+from .utils import string_types, pick_name, is_single_byte
 from .definitions import get_format_description, Field
 from .exceptions import DbfException
 
@@ -16,7 +13,7 @@ from .exceptions import DbfException
 class Dbf(object):
     """Represents data from .dbf file."""
 
-    def __init__(self, fileobj, encoding=None, fieldnames_lower=True):
+    def __init__(self, fileobj, encoding=None, fieldnames_lower=True, encodings=None, raw_strings=False):
         """
         :param fileobj: Python file-like object containing .dbf file data.
 
@@ -25,6 +22,12 @@ class Dbf(object):
 
         :param bool fieldnames_lower: Lowercase field names.
 
+        :param dict encodings: Per-field encoding overrides: field name -> encoding.
+            Useful for legacy DBs mixing code pages.
+
+        :param bool raw_strings: Return character fields values as stripped bytes
+            instead of decoded strings.
+
         """
         self._fileobj = fileobj
         self._lower = fieldnames_lower
@@ -42,14 +45,17 @@ class Dbf(object):
 
         self._encoding = encoding or 'cp866'
 
-        self.fields, self.cls_row = self._read_fields()
+        self.fields = self._read_fields(encodings or {}, raw_strings)
+        self._cls_row = None
+        self._plan = None
 
     def __iter__(self):
         return iter(self.iter_rows())
 
     @classmethod
     @contextmanager
-    def open(cls, dbfile, encoding=None, fieldnames_lower=True, case_sensitive=True):
+    def open(
+            cls, dbfile, encoding=None, fieldnames_lower=True, case_sensitive=True, encodings=None, raw_strings=False):
         """Context manager. Allows opening a .dbf file.
 
         .. code-block::
@@ -66,6 +72,10 @@ class Dbf(object):
 
         :param bool case_sensitive: Whether DB filename is case sensitive.
 
+        :param dict encodings: Per-field encoding overrides: field name -> encoding.
+
+        :param bool raw_strings: Return character fields values as stripped bytes.
+
         :rtype: Dbf
         """
         if not case_sensitive:
@@ -73,11 +83,15 @@ class Dbf(object):
                 dbfile = pick_name(dbfile, listdir(path.dirname(dbfile)))
 
         with open(dbfile, 'rb') as f:
-            yield cls(f, encoding=encoding, fieldnames_lower=fieldnames_lower)
+            yield cls(
+                f, encoding=encoding, fieldnames_lower=fieldnames_lower,
+                encodings=encodings, raw_strings=raw_strings)
 
     @classmethod
     @contextmanager
-    def open_zip(cls, dbname, zipped, encoding=None, fieldnames_lower=True, case_sensitive=True):
+    def open_zip(
+            cls, dbname, zipped, encoding=None, fieldnames_lower=True, case_sensitive=True,
+            encodings=None, raw_strings=False):
         """Context manager. Allows opening a .dbf file from zip archive.
 
         .. code-block::
@@ -96,15 +110,33 @@ class Dbf(object):
 
         :param bool case_sensitive: Whether DB filename is case sensitive.
 
+        :param dict encodings: Per-field encoding overrides: field name -> encoding.
+
+        :param bool raw_strings: Return character fields values as stripped bytes.
+
         :rtype: Dbf
         """
+        from zipfile import ZipFile
+
         with ZipFile(zipped, 'r') as zip_:
 
             if not case_sensitive:
                 dbname = pick_name(dbname, zip_.namelist())
 
             with zip_.open(dbname) as f:
-                yield cls(f, encoding=encoding, fieldnames_lower=fieldnames_lower)
+                yield cls(
+                    f, encoding=encoding, fieldnames_lower=fieldnames_lower,
+                    encodings=encodings, raw_strings=raw_strings)
+
+    @property
+    def cls_row(self):
+        """Named tuple class for rows. Created on first access."""
+        cls_row = self._cls_row
+
+        if cls_row is None:
+            cls_row = self._cls_row = namedtuple('Row', [field.name for field in self.fields])
+
+        return cls_row
 
     def iter_rows(self):
         """Generator reading .dbf row one by one.
@@ -113,58 +145,192 @@ class Dbf(object):
 
         :rtype: Row
         """
+        cast_record = self.cast_record
+
+        for record in self.iter_records():
+            yield cast_record(record)
+
+    def iter_sorted(self, key_fields, reverse=False, memory_limit=None):
+        """Generator reading rows sorted by key fields.
+
+        Records are sorted without decoding where possible.
+        If there are more records than fit in memory limit, sorted runs
+        are stored into temporary files and merged.
+
+        .. code-block::
+
+            for row in dbf.iter_sorted(['name', 'date'], reverse=True):
+                ...
+
+        :param str|unicode|list key_fields: Field name or a list of names.
+
+        :param bool reverse: Sort in descending order.
+
+        :param int memory_limit: Approximate memory limit (bytes) for sorting.
+            Defaults to `sorting.MEMORY_LIMIT`.
+
+        :rtype: Row
+        """
+        from .sorting import iter_sorted  # Imported on demand to keep import of the package fast.
+
+        cast_record = self.cast_record
+
+        for record in iter_sorted(self, key_fields, reverse=reverse, memory_limit=memory_limit):
+            yield cast_record(record)
+
+    def top_n(self, n, key_fields, reverse=False):
+        """Returns first `n` rows sorted by key fields.
+        Only `n` records are kept in memory.
+
+        :param int n: Number of rows.
+
+        :param str|unicode|list key_fields: Field name or a list of names.
+
+        :param bool reverse: Sort in descending order (i.e. get `n` largest).
+
+        :rtype: list[Row]
+        """
+        from .sorting import top_n
+
+        return [self.cast_record(record) for record in top_n(self, n, key_fields, reverse=reverse)]
+
+    def iter_records(self):
+        """Generator reading raw records (bytes) one by one.
+        Deleted records are skipped.
+
+        :rtype: bytes
+        """
+        len_rec = self.prolog.data['len_rec']
+
+        for chunk in self.iter_chunks():
+            for start in range(0, len(chunk), len_rec):
+                record = chunk[start:start + len_rec]
+
+                if record[:1] == b'*':
+                    # Deleted.
+                    continue
+
+                yield record
+
+    def iter_chunks(self, size=1024):
+        """Generator reading raw records in chunks.
+
+        Yields bytes holding up to `size` consecutive records (deleted included).
+
+        :param int size: Max number of records in a chunk.
+
+        :rtype: bytes
+        """
         fileobj = self._fileobj
-        cls_row = self.cls_row
-        fields = self.fields
+        len_rec = self.prolog.data['len_rec']
+        left = self.prolog.records_count
+
+        while left > 0:
+            count = min(size, left)
+            chunk = fileobj.read(count * len_rec)
+
+            if len(chunk) < count * len_rec:
+                raise DbfException('Unexpected end of data. Records read: %s' % (
+                    self.prolog.records_count - left + len(chunk) // len_rec))
+
+            left -= count
+
+            yield chunk
+
+    def cast_record(self, record):
+        """Casts raw record bytes into a row.
+
+        :param bytes record:
+
+        :rtype: Row
+        """
+        plan = self._plan
+
+        if plan is None:
+            encoding = self._encoding
+            # For single-byte encodings character offsets are the same as byte offsets,
+            # so a whole record can be decoded at once and then sliced.
+            plan = self._plan = (
+                is_single_byte(encoding),
+                [
+                    (field.offset, field.offset + field.len, field.is_text and field.encoding == encoding, field)
+                    for field in self.fields
+                ]
+            )
 
-        for idx in range(self.prolog.records_count):
-            data = fileobj.read(1)
+        decode_record, slices = plan
 
-            marker = struct.unpack('<1s', data)[0]
-            is_deleted = marker == b'*'
+        text = None
 
-            if is_deleted:
-                continue
+        if decode_record:
+            try:
+                text = record.decode(self._encoding)
 
-            row_values = []
-            for field in fields:
-                val = field.cast(fileobj.read(field.len))
-                row_values.append(val)
+            except UnicodeDecodeError:
+                # Some field data is undecodable as a whole (e.g. it has its own encoding).
+                pass
 
-            yield cls_row(*row_values)
+        if text is None:
+            row_values = [field.cast(record[start:end]) for start, end, _, field in slices]
 
-    def _read_fields(self):
-        fh = self._fileobj
-        field_from_file = partial(self.cls_field.from_file, name_lower=self._lower, encoding=self._encoding)
+        else:
+            row_values = [
+                field.cast_text(text[start:end]) if is_text else field.cast(record[start:end])
+                for start, end, is_text, field in slices]
+
+        return self.cls_row(*row_values)
+
+    def _read_fields(self, encodings, raw_strings):
+        prolog = self.prolog
+        cls_field = self.cls_field
+
+        # The rest of the header is read at once: field descriptors followed by a terminator.
+        len_fields = prolog.fields_count * cls_field._struct_size
+        header = self._fileobj.read(prolog.data['len_head'] - 1 - prolog._struct_size)
+
+        if header[len_fields:len_fields + 1] != b'\r':
+            raise DbfException(
+                'Header termination byte not found. '
+                'Seems to be an unsupported format. Signature: %s' % self.signature)
+
+        lower = self._lower
+        encoding = self._encoding
 
         fields = []
         field_names = []
-        for idx in range(self.prolog.fields_count):
-            field = field_from_file(fh)  # type: Field
+        offset = 1  # Deletion marker.
+
+        for field in cls_field.iter_from_bytes(header[:len_fields]):  # type: Field
             name = field.name
 
+            if lower:
+                name = name.lower()
+
             if name in field_names:
                 # Handle duplicates.
                 name = name + '_'
-                field.set_name(name)
+
+            field.set_name(name)
+            field.encoding = encodings.get(name, encoding)
+            field.raw = raw_strings
+            field.offset = offset
+            offset += field.len
 
             fields.append(field)
             field_names.append(name)
 
-        terminator = struct.unpack('<c', fh.read(1))[0]
-
-        if terminator != b'\r':
-            raise DbfException(
-                'Header termination byte not found. '
-                'Seems to be an unsupported format. Signature: %s' % self.signature)
+        unknown = set(encodings).difference(field_names)
 
-        cls_row = namedtuple('Row', field_names)
+        if unknown:
+            raise DbfException('Encodings given for unknown fields: %s' % ', '.join(sorted(unknown)))
 
-        return fields, cls_row
+        return fields
 
 
 @contextmanager
-def open_db(db, zipped=None, encoding=None, fieldnames_lower=True, case_sensitive=True):
+def open_db(
+        db, zipped=None, encoding=None, fieldnames_lower=True, case_sensitive=True,
+        encodings=None, raw_strings=False):
     """Context manager. Allows reading DBF file (maybe even from zip).
 
     :param str|unicode|file db: .dbf file name or a file-like object.
@@ -178,12 +344,18 @@ def open_db(db, zipped=None, encoding=None, fieldnames_lower=True, case_sensitiv
 
     :param bool case_sensitive: Whether DB filename is case sensitive.
 
+    :param dict encodings: Per-field encoding overrides: field name -> encoding.
+
+    :param bool raw_strings: Return character fields values as stripped bytes.
+
     :rtype: Dbf
     """
     kwargs = dict(
         encoding=encoding,
         fieldnames_lower=fieldnames_lower,
         case_sensitive=case_sensitive,
+        encodings=encodings,
+        raw_strings=raw_strings,
     )
 
     if zipped:
@@ -0,0 +1,243 @@
+# -*- encoding: utf-8 -*-
+from __future__ import unicode_literals
+
+import heapq
+
+from .exceptions import DbfException
+from .utils import string_types, is_order_preserving
+
+MEMORY_LIMIT = 64 * 1024 * 1024
+"""Default approximate memory limit (bytes) for in-memory sorting."""
+
+MAX_RUNS = 64
+"""Max number of sorted runs (temporary files) merged at once."""
+
+RECORD_OVERHEAD = 120
+"""Approximate memory (bytes) used by a record in addition to its data (object headers, key, list slot)."""
+
+
+def get_key(dbf, key_fields):
+    """Returns a function to get sort key from a raw record.
+
+    Raw (stripped) field bytes are used as a key part where their order
+    is the same as the order of cast values (dates, character fields in
+    order preserving encodings), so no decoding is done for those.
+    Other values are cast. Empty values go first.
+
+    :param Dbf dbf:
+
+    :param str|unicode|list key_fields: Field name or a list of names.
+
+    :rtype: callable
+    """
+    if isinstance(key_fields, string_types):
+        key_fields = [key_fields]
+
+    if not key_fields:
+        raise DbfException('No key fields given.')
+
+    by_name = {field.name: field for field in dbf.fields}
+    unknown = [name for name in key_fields if name not in by_name]
+
+    if unknown:
+        raise DbfException('Unknown key fields: %s' % ', '.join(unknown))
+
+    parts = []
+
+    for name in key_fields:
+        field = by_name[name]
+        start = field.offset
+        end = start + field.len
+
+        if field.type == b'D' or (field.type == b'C' and (field.raw or is_order_preserving(field.encoding))):
+            # Sort on raw bytes.
+            field = None
+
+        parts.append((start, end, field))
+
+    def key(record):
+        values = []
+
+        for start, end, field in parts:
+            value = record[start:end]
+
+            if field is None:
+                values.append(value.strip())
+
+            else:
+                value = field.cast(value)
+                values.append((value is not None, value))
+
+        return tuple(values)
+
+    return key
+
+
+def iter_sorted(dbf, key_fields, reverse=False, memory_limit=None):
+    """Generator yielding raw records sorted by key fields.
+
+    Sorted runs are spilled to temporary files when memory limit
+    is exceeded and then merged. No more than `MAX_RUNS` runs are merged
+    at once: runs are merged into bigger ones as they accumulate.
+
+    :param Dbf dbf:
+
+    :param str|unicode|list key_fields: Field name or a list of names.
+
+    :param bool reverse: Sort in descending order.
+
+    :param int memory_limit: Approximate memory limit (bytes) for in-memory sorting.
+        Defaults to `MEMORY_LIMIT`.
+
+    :rtype: bytes
+    """
+    if memory_limit is None:
+        memory_limit = MEMORY_LIMIT
+
+    key = get_key(dbf, key_fields)
+    len_rec = dbf.prolog.data['len_rec']
+    run_size = max(memory_limit // (len_rec + RECORD_OVERHEAD), 1)
+
+    def merge(runs):
+        return _merge([_iter_run(run, len_rec) for run, _ in runs], key, reverse)
+
+    def merge_tail(runs):
+        # Last runs are merged into a bigger one to limit the number of open files.
+        tail = runs[-MAX_RUNS:]
+        merged = _spill(merge(tail)), max(level for _, level in tail) + 1
+
+        for run, _ in tail:
+            run.close()
+
+        runs[-MAX_RUNS:] = [merged]
+
+    runs = []  # (file, level) pairs in records order.
+    records = []
+
+    try:
+        for record in dbf.iter_records():
+            records.append(record)
+
+            if len(records) >= run_size:
+                records.sort(key=key, reverse=reverse)
+                runs.append((_spill(records), 0))
+                records = []
+
+                while len(runs) >= MAX_RUNS and len(set(level for _, level in runs[-MAX_RUNS:])) == 1:
+                    merge_tail(runs)
+
+        records.sort(key=key, reverse=reverse)
+
+        if not runs:
+            for record in records:
+                yield record
+            return
+
+        if records:
+            runs.append((_spill(records), 0))
+            records = []
+
+        while len(runs) > MAX_RUNS:
+            merge_tail(runs)
+
+        for record in merge(runs):
+            yield record
+
+    finally:
+        for run, _ in runs:
+            run.close()
+
+
+def top_n(dbf, n, key_fields, reverse=False):
+    """Returns first `n` raw records sorted by key fields.
+
+    Only `n` records are kept in memory at a time.
+
+    :param Dbf dbf:
+
+    :param int n: Number of records.
+
+    :param str|unicode|list key_fields: Field name or a list of names.
+
+    :param bool reverse: Sort in descending order (i.e. get `n` largest).
+
+    :rtype: list
+    """
+    pick = heapq.nlargest if reverse else heapq.nsmallest
+
+    return pick(n, dbf.iter_records(), key=get_key(dbf, key_fields))
+
+
+class _Reversed(object):
+    """Sort key wrapper with reversed comparison."""
+
+    __slots__ = ['key']
+
+    def __init__(self, key):
+        self.key = key
+
+    def __eq__(self, other):
+        return self.key == other.key
+
+    def __lt__(self, other):
+        return other.key < self.key
+
+
+def _merge(iterators, key, reverse):
+    """Merges sorted iterators of records (k-way merge).
+
+    Equal records are yielded in iterators order.
+
+    """
+    get_key = key
+
+    if reverse:
+        def get_key(record):
+            return _Reversed(key(record))
+
+    heap = []
+
+    for idx, iterator in enumerate(iterators):
+        record = next(iterator, None)
+
+        if record is not None:
+            heap.append((get_key(record), idx, record, iterator))
+
+    heapq.heapify(heap)
+
+    while heap:
+        _, idx, record, iterator = heap[0]
+
+        yield record
+
+        record = next(iterator, None)
+
+        if record is None:
+            heapq.heappop(heap)
+
+        else:
+            heapq.heapreplace(heap, (get_key(record), idx, record, iterator))
+
+
+def _spill(records):
+    from tempfile import TemporaryFile  # Imported on demand to keep import of the package fast.
+
+    run = TemporaryFile()
+    run.writelines(records)
+    run.seek(0)
+
+    return run
+
+
+def _iter_run(run, len_rec, chunk_records=1024):
+    read = run.read
+    chunk_len = len_rec * chunk_records
+
+    while True:
+        chunk = read(chunk_len)
+
+        if not chunk:
+            break
+
+        for start in range(0, len(chunk), len_rec):
+            yield chunk[start:start + len_rec]
@@ -3,6 +3,7 @@ from __future__ import unicode_literals
 from os import path
 
 import codecs
+import struct
 
 
 try:
@@ -16,6 +17,66 @@ def bytes_to_int(val):
     return int(codecs.encode(val, 'hex'), 16)
 
 
+_SINGLE_BYTE = {}
+
+
+def is_single_byte(encoding):
+    """Returns True if every byte is decoded into exactly one character
+    using the given encoding. Results are cached.
+
+    :param str|unicode encoding:
+    :rtype: bool
+    """
+    single = _SINGLE_BYTE.get(encoding)
+
+    if single is None:
+        decoder = codecs.getincrementaldecoder(encoding)
+        single = all(
+            len(decoder('replace').decode(struct.pack('B', code))) == 1
+            for code in range(256))
+        _SINGLE_BYTE[encoding] = single
+
+    return single
+
+
+_ORDER_PRESERVING = {}
+
+
+def is_order_preserving(encoding):
+    """Returns True if encoded strings (bytes) are ordered the same
+    as decoded ones. Results are cached.
+
+    :param str|unicode encoding:
+    :rtype: bool
+    """
+    preserving = _ORDER_PRESERVING.get(encoding)
+
+    if preserving is None:
+
+        if codecs.lookup(encoding).name == 'utf-8':
+            preserving = True
+
+        elif is_single_byte(encoding):
+            codes = []
+
+            for code in range(256):
+                try:
+                    codes.append(ord(struct.pack('B', code).decode(encoding)))
+
+                except UnicodeDecodeError:
+                    # Undefined bytes are not expected in data.
+                    continue
+
+            preserving = codes == sorted(codes)
+
+        else:
+            preserving = False
+
+        _ORDER_PRESERVING[encoding] = preserving
+
+    return preserving
+
+
 def pick_name(filename, candidates):
     filedir = path.dirname(filename)
     name_lower = path.basename(filename).lower()
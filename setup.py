@@ -43,6 +43,7 @@ setup(
     setup_requires=[] + (['pytest-runner'] if 'test' in sys.argv else []),
     extras_require={
         'cli': ['click'],
+        'pandas': ['pandas'],
     },
 
     entry_points={
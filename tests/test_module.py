@@ -1,6 +1,7 @@
 # -*- encoding: utf-8 -*-
 from __future__ import unicode_literals
 from os import path
+import struct
 from decimal import Decimal
 
 from contextlib import contextmanager
@@ -8,6 +9,7 @@ from contextlib import contextmanager
 import pytest
 
 from dbf_light import Dbf, open_db
+from dbf_light.exceptions import DbfException
 
 try:
     sting_types = basestring
@@ -90,3 +92,216 @@ def test_open_db(dir_fixtures):
 
     with open_db( path.join(dir_fixtures, 'bik_swif.dbf'), case_sensitive=False) as dbf:
         assert dbf.prolog.records_count == 369
+
+
+def test_encodings(dir_fixtures):
+    fpath = path.join(dir_fixtures, 'bik_swif.dbf')
+    expected = '"СИБСОЦБАНК" ООО'
+
+    with open_db(fpath, raw_strings=True) as dbf:
+        for row in dbf:
+            assert row.name_srus == expected.encode('cp866')
+            break
+
+    with open_db(fpath, encodings={'name_srus': 'cp1251'}) as dbf:
+        for row in dbf:
+            assert row.name_srus == expected.encode('cp866').decode('cp1251')
+            break
+
+    with pytest.raises(DbfException):
+        with open_db(fpath, encodings={'unknown': 'cp1251'}):
+            pass
+
+
+def test_header_only(read_db):
+
+    with read_db('dbase_03.dbf') as dbf:
+        assert dbf.prolog.records_count == 14
+        assert [field.name for field in dbf.fields[:3]] == ['point_id', 'type', 'shape']
+        assert [field.offset for field in dbf.fields[:3]] == [1, 13, 33]
+
+        for row in dbf:
+            assert type(row) is dbf.cls_row
+            break
+
+
+def test_dataframe(dir_fixtures):
+    pytest.importorskip('pandas')
+
+    from dbf_light import read_dataframe
+
+    fpath = path.join(dir_fixtures, 'dbase_8b.dbf')
+
+    df = read_dataframe(fpath)
+    assert df.shape == (10, 6)
+    assert str(df['numerical'].dtype) == 'float64'
+    assert str(df['logical'].dtype) == 'boolean'
+    assert str(df['memo'].dtype) == 'Int64'
+    assert str(df['date'].dtype) == 'datetime64[s]'
+    assert df['character'][0] == 'One'
+
+    chunks = list(read_dataframe(fpath, columns=['character'], chunksize=4, categorical=['character']))
+    assert [len(chunk) for chunk in chunks] == [4, 4, 2]
+    assert list(chunks[0].columns) == ['character']
+    assert str(chunks[0]['character'].dtype) == 'category'
+
+    with pytest.raises(DbfException):
+        read_dataframe(fpath, columns=['unknown'])
+
+    with pytest.raises(DbfException):
+        read_dataframe(fpath, categorical=['unknown'])
+
+    df = read_dataframe('bik_swif.dbf', zipped=path.join(dir_fixtures, 'bik_swift-bik.zip'), case_sensitive=False)
+    assert df['name_srus'][0] == '"СИБСОЦБАНК" ООО'
+
+
+def test_dataframe_empty(dir_fixtures, tmpdir):
+    pytest.importorskip('pandas')
+
+    from dbf_light import read_dataframe
+
+    fpath = path.join(dir_fixtures, 'dbase_8b.dbf')
+    expected = read_dataframe(fpath).dtypes
+
+    with Dbf.open(fpath) as dbf:
+        len_head = dbf.prolog.data['len_head']
+        len_rec = dbf.prolog.data['len_rec']
+
+    with open(fpath, 'rb') as f:
+        data = bytearray(f.read())
+
+    # No records.
+    fpath_empty = '%s' % tmpdir.join('empty.dbf')
+
+    with open(fpath_empty, 'wb') as f:
+        f.write(data[:4] + struct.pack('<I', 0) + data[8:len_head])
+
+    df = read_dataframe(fpath_empty)
+    assert len(df) == 0
+    assert df.dtypes.equals(expected)
+
+    # First chunk has deleted records only.
+    fpath_deleted = '%s' % tmpdir.join('deleted.dbf')
+
+    for idx in range(4):
+        data[len_head + len_rec * idx] = ord('*')
+
+    with open(fpath_deleted, 'wb') as f:
+        f.write(data)
+
+    chunks = list(read_dataframe(fpath_deleted, chunksize=4))
+    assert [len(chunk) for chunk in chunks] == [4, 2]
+    assert all(chunk.dtypes.equals(expected) for chunk in chunks)
+
+
+def test_sorted(read_db, monkeypatch):
+    from dbf_light import sorting
+
+    def get_key(row):
+        return row.date_visit, row.point_id
+
+    with read_db('dbase_03.dbf') as dbf:
+        expected = sorted(dbf, key=get_key, reverse=True)
+
+    for memory_limit in (10 ** 6, 1000):  # In memory and with temporary files.
+        with read_db('dbase_03.dbf') as dbf:
+            rows = list(dbf.iter_sorted(['date_visit', 'point_id'], reverse=True, memory_limit=memory_limit))
+            assert rows == expected
+
+    # Runs are merged into bigger ones when there are too many of them.
+    monkeypatch.setattr(sorting, 'MAX_RUNS', 3)
+
+    with read_db('dbase_03.dbf') as dbf:
+        rows = list(dbf.iter_sorted(['date_visit', 'point_id'], reverse=True, memory_limit=1))
+        assert rows == expected
+
+    with read_db('dbase_83.dbf') as dbf:
+        rows = dbf.top_n(3, 'cost', reverse=True)
+        assert [row.cost for row in rows] == [Decimal('49.95'), Decimal('49.50'), Decimal('48.50')]
+
+    with read_db('dbase_83.dbf') as dbf:
+        with pytest.raises(DbfException):
+            dbf.top_n(3, 'unknown')
+
+
+def test_diff(dir_fixtures, tmpdir):
+    from dbf_light import diff
+
+    fpath_old = path.join(dir_fixtures, 'bik_swif.dbf')
+    fpath_new = '%s' % tmpdir.join('new.dbf')
+
+    with Dbf.open(fpath_old) as dbf:
+        len_head = dbf.prolog.data['len_head']
+        len_rec = dbf.prolog.data['len_rec']
+        offset = [field.offset for field in dbf.fields if field.name == 'name_srus'][0]
+
+    with open(fpath_old, 'rb') as f:
+        data = bytearray(f.read())
+
+    # Replace the first 4 chars of `name_srus` in the first record.
+    start = len_head + offset
+    data[start:start + 4] = 'ТЕСТ'.encode('cp866')
+
+    # Mark the sixth record as deleted.
+    data[len_head + len_rec * 5] = ord('*')
+
+    with open(fpath_new, 'wb') as f:
+        f.write(data)
+
+    changes = list(diff(fpath_old, fpath_new, key='kod_rus'))
+    assert [change.kind for change in changes] == ['updated', 'deleted']
+    assert changes[0].old.name_srus == '"СИБСОЦБАНК" ООО'
+    assert changes[0].new.name_srus == 'ТЕСТСОЦБАНК" ООО'
+    assert changes[1].new is None
+
+    with Dbf.open(fpath_new) as dbf_old:
+        with Dbf.open(fpath_old) as dbf_new:
+            changes = list(diff(dbf_old, dbf_new, key=['kod_swift', 'kod_rus'], memory_limit=2000))
+            assert sorted(change.kind for change in changes) == ['inserted', 'updated']
+
+    with pytest.raises(DbfException):
+        list(diff(fpath_old, path.join(dir_fixtures, 'dbase_03.dbf'), key='kod_rus'))
+
+    # Copy the first record over the second one to get a duplicate key.
+    data[len_head + len_rec:len_head + len_rec * 2] = data[len_head:len_head + len_rec]
+
+    with open(fpath_new, 'wb') as f:
+        f.write(data)
+
+    with pytest.raises(DbfException) as e:
+        list(diff(fpath_old, fpath_new, key='kod_rus'))
+
+    assert 'Duplicate key in new DB' in '%s' % e.value
+
+
+def test_dataframe_dates(dir_fixtures, tmpdir):
+    pytest.importorskip('pandas')
+
+    from dbf_light import read_dataframe
+
+    fpath = path.join(dir_fixtures, 'dbase_8b.dbf')
+
+    with Dbf.open(fpath) as dbf:
+        len_head = dbf.prolog.data['len_head']
+        len_rec = dbf.prolog.data['len_rec']
+        offset = [field.offset for field in dbf.fields if field.name == 'date'][0]
+
+    with open(fpath, 'rb') as f:
+        data = bytearray(f.read())
+
+    def write_date(value):
+        start = len_head + offset
+        data[start:start + 8] = value
+
+        fpath_new = '%s' % tmpdir.join('dates.dbf')
+
+        with open(fpath_new, 'wb') as f:
+            f.write(data)
+
+        return fpath_new
+
+    df = read_dataframe(write_date(b'00000000'))
+    assert df['date'].isna()[0]
+
+    with pytest.raises(DbfException):
+        read_dataframe(write_date(b'20200231'))